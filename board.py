@@ -2,44 +2,59 @@
 Модуль для работы с шахматной доской и управления игровым процессом.
 """
 
+import sys
+from array import array
+
 from figures import Pawn, Rook, Knight, Bishop, Queen, King as ChessKing, Checker, CheckerKing, LightRook, ShortBishop, Guardian
-import copy
+from figures import CODE_COUNT, SYMBOLS, PAWN, KING, CHECKER, CHECKER_KING, LIGHT_ROOK, GUARDIAN
+from figures import KING_ATTACKS, MOVE_TO_SHIFT, MOVE_CODE_SHIFT, MOVE_CAPTURED_SHIFT, MOVE_CAPTURED_SQUARE_SHIFT
+from figures import PIECES, pack_move, shared_figure, en_passant_target
+from board_kernels import HAVE_NUMBA, FULL_MASK, as_array, attacks_mask
 
+# Таблицы перевода между алгебраической нотацией и индексами доски.
+_ALG2IDX = {f"{c}{r}": (8 - r, ord(c.lower()) - ord('a')) for c in "ABCDEFGHabcdefgh" for r in range(1, 9)}
+_IDX2ALG = [f"{chr(column + ord('A'))}{8 - row}" for row in range(8) for column in range(8)]
 
-class MoveHistory:
-    """
-    Класс для хранения информации о выполненном ходе.
+# Числовые теги типов игры.
+CHESS, CHECKERS, MODIFIED_CHESS = range(3)
+GAME_TYPES = {"chess": CHESS, "checkers": CHECKERS, "modified_chess": MODIFIED_CHESS}
 
-    Attributes:
-        from_pos (str): Позиция, с которой была перемещена фигура.
-        to_pos (str): Позиция, на которую была перемещена фигура.
-        moved_figure (Figure): Фигура, которая была перемещена.
-        captured_figure (Figure): Фигура, которая была взята (если есть).
-        last_move (tuple): Информация о последнем ходе.
-        board_state (tuple): Состояние доски и фигур перед ходом.
-        current_player (str): Игрок, который выполнил ход.
+# Превращения при достижении последней горизонтали по типу фигуры:
+# (тег типа игры, класс новой фигуры). Для пешки фигуру выбирает игрок.
+PROMOTE_TABLE = tuple({
+    PAWN: (CHESS, None),
+    CHECKER: (CHECKERS, CheckerKing),
+    LIGHT_ROOK: (MODIFIED_CHESS, Rook),
+}.get(ptype) for ptype in range(GUARDIAN + 1))
+
+# Фигуры крайней горизонтали (от A до H) для шахмат и модифицированных шахмат.
+CHESS_BACK_RANK = (Rook, Knight, Bishop, Queen, ChessKing, Bishop, Knight, Rook)
+MODIFIED_BACK_RANK = (LightRook, Guardian, ShortBishop, Queen, ChessKing, ShortBishop, Guardian, LightRook)
+
+# Коды шахматного короля каждого цвета (индексы в Board.bb).
+KING_CODES = {"white": KING << 1, "black": KING << 1 | 1}
+
+# Имена сторон по биту цвета в коде фигуры.
+SIDE_NAMES = ("white", "black")
+
+# Фигуры, доступные при превращении пешки, по букве выбора.
+PROMOTION_CHOICES = {"Q": Queen, "R": Rook, "B": Bishop, "N": Knight}
+
+
+def _prompt_for_promotion(color):
     """
+    Запрашивает у игрока фигуру для превращения пешки.
 
-    def __init__(self, from_pos, to_pos, moved_figure, captured_figure, last_move, board_state, current_player):
-        """
-        Инициализирует объект MoveHistory.
+    Args:
+        color (str): Цвет пешки.
 
-        Args:
-            from_pos (str): Позиция, с которой была перемещена фигура.
-            to_pos (str): Позиция, на которую была перемещена фигура.
-            moved_figure (Figure): Фигура, которая была перемещена.
-            captured_figure (Figure): Фигура, которая была взята (если есть).
-            last_move (tuple): Информация о последнем ходе.
-            board_state (tuple): Состояние доски и фигур перед ходом.
-            current_player (str): Игрок, который выполнил ход.
-        """
-        self.from_pos = from_pos
-        self.to_pos = to_pos
-        self.moved_figure = moved_figure
-        self.captured_figure = captured_figure
-        self.last_move = last_move
-        self.board_state = board_state
-        self.current_player = current_player
+    Returns:
+        str: Буква выбранной фигуры (Q, R, B или N).
+    """
+    choice = input("Выберите фигуру для замены (Q - ферзь, R - ладья, B - слон, N - конь): ").upper()
+    while choice not in PROMOTION_CHOICES:
+        choice = input("Некорректный выбор. Введите Q, R, B или N: ").upper()
+    return choice
 
 
 class Board:
@@ -48,27 +63,57 @@ class Board:
 
     Attributes:
         game_type (str): Тип игры (шахматы, шашки, модифицированные шахматы).
-        board (list): Двумерный список, представляющий доску.
-        figures (dict): Словарь, хранящий фигуры и их позиции.
-        last_move (tuple): Информация о последнем выполненном ходе.
-        move_history (list): История всех ходов.
-        enemy_to_capture (tuple): Позиция фигуры, которую нужно взять (для шашек).
+        board (bytearray): Коды фигур по клеткам 0..63 (0 — пустая клетка).
+        bb (list): Битборды фигур, индексируемые кодом фигуры.
+        bb_by_color (dict): Битборды всех фигур каждого цвета.
+        occupied (int): Битборд всех занятых клеток.
+        attacks (dict): Битборды клеток, атакуемых фигурами каждого цвета, или
+            None, если позиция изменилась и они еще не пересчитаны (см. threat_mask).
+        figures (list): Фигуры по номеру клетки (row * 8 + column), None для
+            пустой клетки; позиция фигуры определяется только индексом.
+        by_color (dict): Словари фигур каждого цвета по номеру клетки.
+        last_move (int): Последний выполненный ход, упакованный pack_move
+            (0, если ходов не было).
+        move_history (array): История всех ходов в упакованном виде.
+        ep_target (int): Клетка, на которую возможно взятие на проходе
+            (None, если последний ход не был ходом пешки на две клетки).
         move_count (int): Счетчик количества выполненных ходов.
     """
 
-    def __init__(self, game_type="chess"):
+    __slots__ = ("game_type", "_gt", "_promote", "_special_capture", "board", "bb", "bb_by_color",
+                 "occupied", "attacks", "_threat_cache", "figures", "by_color", "last_move",
+                 "ep_target", "move_history", "move_count")
+
+    def __init__(self, game_type="chess", promotion_cb=None):
         """
         Инициализирует объект Board.
 
         Args:
             game_type (str, optional): Тип игры. По умолчанию "chess".
+            promotion_cb (callable, optional): Функция выбора фигуры при превращении
+                пешки: принимает цвет и возвращает Q, R, B или N. По умолчанию
+                выбор запрашивается у игрока.
         """
         self.game_type = game_type
+        self._promote = promotion_cb or _prompt_for_promotion
+        self._gt = GAME_TYPES.get(game_type)
+        # Особые взятия зависят только от варианта игры, поэтому проверка
+        # выбирается один раз, а не на каждом ходу.
+        self._special_capture = {
+            CHESS: self.en_passant_square,
+            CHECKERS: self.checkers_capture_square,
+        }.get(self._gt)
         self.board = self.create_board()
-        self.figures = {}
-        self.last_move = None
-        self.move_history = []
-        self.enemy_to_capture = None
+        self.bb = [0] * CODE_COUNT
+        self.bb_by_color = {"white": 0, "black": 0}
+        self.occupied = 0
+        self.attacks = None
+        self._threat_cache = (None, None, None)
+        self.figures = [None] * 64
+        self.by_color = {"white": {}, "black": {}}
+        self.last_move = 0
+        self.ep_target = None
+        self.move_history = array("L")
         self.move_count = 0
 
     def create_board(self):
@@ -76,9 +121,9 @@ class Board:
         Создает пустую шахматную доску.
 
         Returns:
-            list: Двумерный список, представляющий пустую доску.
+            bytearray: Коды фигур по клеткам, для пустой доски все нули.
         """
-        return [["." for _ in range(8)] for _ in range(8)]
+        return bytearray(64)
 
     def display(self, threatened_positions=None):
         """
@@ -90,21 +135,18 @@ class Board:
         if threatened_positions is None:
             threatened_positions = set()
 
-        print("  A B C D E F G H")
-        for i, row in enumerate(self.board):
-            print(f"{8 - i} ", end="")
-            for j, cell in enumerate(row):
-                if cell != ".":
-                    pos = (i, j)
-                    if pos in threatened_positions:
+        board = self.board
+        out = ["  A B C D E F G H\n"]
+        for i in range(8):
+            row_tokens = list(board[i * 8:i * 8 + 8].translate(SYMBOLS).decode())
+            if threatened_positions:
+                for j in range(8):
+                    if board[i * 8 + j] and (i, j) in threatened_positions:
                         # Красный цвет для угрожаемых фигур
-                        print(f"\033[91m{cell}\033[0m", end=" ")
-                    else:
-                        print(cell, end=" ")
-                else:
-                    print(cell, end=" ")
-            print(f"{8 - i}")
-        print("  A B C D E F G H")
+                        row_tokens[j] = "\033[91m" + row_tokens[j] + "\033[0m"
+            out.append(f"{8 - i} " + " ".join(row_tokens) + f" {8 - i}\n")
+        out.append("  A B C D E F G H\n")
+        sys.stdout.write("".join(out))
 
     def algebraic_to_indices(self, position):
         """
@@ -119,11 +161,10 @@ class Board:
         Raises:
             ValueError: Если позиция некорректна.
         """
-        if len(position) != 2 or not position[0].isalpha() or not position[1].isdigit():
-            raise ValueError("Некорректная позиция.")
-        column = ord(position[0].lower()) - ord('a')
-        row = 8 - int(position[1])
-        return row, column
+        try:
+            return _ALG2IDX[position]
+        except KeyError:
+            raise ValueError("Некорректная позиция.") from None
 
     def indices_to_algebraic(self, row, column):
         """
@@ -136,9 +177,7 @@ class Board:
         Returns:
             str: Позиция в алгебраической нотации.
         """
-        column_letter = chr(column + ord('a'))
-        row_number = 8 - row
-        return str(column_letter.upper()) + str(row_number)
+        return _IDX2ALG[row * 8 + column]
 
     def place_figure(self, figure, position):
         """
@@ -152,11 +191,22 @@ class Board:
             ValueError: Если клетка уже занята.
         """
         row, column = self.algebraic_to_indices(position)
-        if self.board[row][column] != ".":
+        if self.board[row * 8 + column]:
             raise ValueError("Данная клетка уже занята. Попробуйте снова.")
-        self.board[row][column] = figure.symbol
-        self.figures[(row, column)] = figure
-        figure.set_position(row, column)
+        self.put_on_square(row * 8 + column, figure)
+
+    def place_figure_fast(self, row, column, figure):
+        """
+        Размещает фигуру по индексам без разбора нотации и проверок.
+
+        Используется при расстановке: не проверяет занятость клетки.
+
+        Args:
+            row (int): Номер строки.
+            column (int): Номер столбца.
+            figure (Figure): Фигура для размещения.
+        """
+        self.put_on_square(row * 8 + column, figure)
 
     def remove_figure(self, position):
         """
@@ -169,10 +219,94 @@ class Board:
             ValueError: Если на клетке нет фигуры.
         """
         row, column = self.algebraic_to_indices(position)
-        if self.board[row][column] == ".":
+        if not self.board[row * 8 + column]:
             raise ValueError(f"На клетке {position} нет фигуры для удаления.")
-        self.board[row][column] = "."
-        del self.figures[(row, column)]
+        self.take_from_square(row * 8 + column)
+
+    def put_on_square(self, square, figure):
+        """
+        Ставит фигуру на клетку, обновляя доску, битборды и словарь фигур.
+
+        Args:
+            square (int): Номер клетки (row * 8 + column).
+            figure (Figure): Фигура для размещения.
+        """
+        bit = 1 << square
+        code = figure.code
+        color = figure.color
+        self.board[square] = code
+        self.bb[code] |= bit
+        self.bb_by_color[color] |= bit
+        self.occupied |= bit
+        self.figures[square] = figure
+        self.by_color[color][square] = figure
+        self.attacks = None
+        self._threat_cache = (None, None, None)
+
+    def take_from_square(self, square):
+        """
+        Снимает фигуру с клетки, обновляя доску, битборды и словарь фигур.
+
+        Args:
+            square (int): Номер клетки (row * 8 + column).
+
+        Returns:
+            Figure: Снятая фигура.
+        """
+        bit = 1 << square
+        figures = self.figures
+        figure = figures[square]
+        figures[square] = None
+        color = figure.color
+        self.board[square] = 0
+        self.bb[figure.code] ^= bit
+        self.bb_by_color[color] ^= bit
+        self.occupied ^= bit
+        del self.by_color[color][square]
+        self.attacks = None
+        self._threat_cache = (None, None, None)
+        return figure
+
+    def update_attacks(self):
+        """
+        Пересчитывает битборды клеток, атакуемых фигурами каждого цвета.
+
+        Вызывается из threat_mask при первом запросе после изменения позиции.
+        При установленном Numba используется скомпилированное ядро из
+        board_kernels, иначе атаки собираются через attack_mask фигур.
+        """
+        if HAVE_NUMBA:
+            board_arr = as_array(self.board)
+            self.attacks = {
+                "white": attacks_mask(board_arr, 0) & FULL_MASK,
+                "black": attacks_mask(board_arr, 1) & FULL_MASK,
+            }
+        else:
+            occupied = self.occupied
+            attacks = {}
+            for color, figures in self.by_color.items():
+                mask = 0
+                for square, figure in figures.items():
+                    mask |= figure.attack_mask(square, occupied)
+                attacks[color] = mask
+            self.attacks = attacks
+
+    def threat_mask(self, side):
+        """
+        Возвращает битборд клеток, атакуемых фигурами указанного цвета.
+
+        Битборды атак пересчитываются лениво: изменение позиции только
+        сбрасывает их, а пересчет происходит при первом запросе.
+
+        Args:
+            side (str): Цвет атакующих фигур.
+
+        Returns:
+            int: Битборд атакуемых клеток.
+        """
+        if self.attacks is None:
+            self.update_attacks()
+        return self.attacks[side]
 
     def get_piece(self, row, column):
         """
@@ -185,7 +319,7 @@ class Board:
         Returns:
             Figure: Фигура или None, если клетка пуста.
         """
-        return self.figures.get((row, column), None)
+        return self.figures[row * 8 + column]
 
     def get_figure(self, position):
         """
@@ -198,101 +332,49 @@ class Board:
             Figure: Фигура или None, если клетка пуста.
         """
         row, column = self.algebraic_to_indices(position)
-        return self.get_piece(row, column)
-
-    def save_state(self):
-        """
-        Сохраняет текущее состояние доски и фигур.
-
-        Returns:
-            tuple: Кортеж (состояние доски, состояние фигур).
-        """
-        board_copy = copy.deepcopy(self.board)
-        figures_copy = copy.deepcopy(self.figures)
-        return board_copy, figures_copy
-
-    def restore_state(self, board_state, figures_state, last_move):
-        """
-        Восстанавливает состояние доски и фигур.
-
-        Args:
-            board_state (list): Состояние доски.
-            figures_state (dict): Состояние фигур.
-            last_move (tuple): Информация о последнем ходе.
-        """
-        self.board = board_state
-        self.figures = figures_state
-        self.last_move = last_move
+        return self.figures[row * 8 + column]
 
     def setup_board(self):
         """Настраивает доску в зависимости от типа игры."""
-        if self.game_type == "chess":
+        if self._gt == CHESS:
             self.setup_chess()
-        elif self.game_type == "checkers":
+        elif self._gt == CHECKERS:
             self.setup_checkers()
-        elif self.game_type == "modified_chess":
+        elif self._gt == MODIFIED_CHESS:
             self.setup_modified_chess()
 
     def setup_chess(self):
         """Настраивает доску для игры в шахматы."""
-        self.place_figure(Rook("white"), "A1")
-        self.place_figure(Knight("white"), "B1")
-        self.place_figure(Bishop("white"), "C1")
-        self.place_figure(Queen("white"), "D1")
-        self.place_figure(ChessKing("white"), "E1")
-        self.place_figure(Bishop("white"), "F1")
-        self.place_figure(Knight("white"), "G1")
-        self.place_figure(Rook("white"), "H1")
-        for column in "ABCDEFGH":
-            self.place_figure(Pawn("white"), column + "2")
-
-        self.place_figure(Rook("black"), "A8")
-        self.place_figure(Knight("black"), "B8")
-        self.place_figure(Bishop("black"), "C8")
-        self.place_figure(Queen("black"), "D8")
-        self.place_figure(ChessKing("black"), "E8")
-        self.place_figure(Bishop("black"), "F8")
-        self.place_figure(Knight("black"), "G8")
-        self.place_figure(Rook("black"), "H8")
-        for column in "ABCDEFGH":
-            self.place_figure(Pawn("black"), column + "7")
+        self.setup_ranks(CHESS_BACK_RANK)
 
     def setup_checkers(self):
         """Настраивает доску для игры в шашки."""
         for row in range(5, 8):
             for col in range(8):
                 if (row + col) % 2 == 1:
-                    pos = self.indices_to_algebraic(row, col)
-                    self.place_figure(Checker("white"), pos)
+                    self.place_figure_fast(row, col, shared_figure(Checker, "white"))
         for row in range(3):
             for col in range(8):
                 if (row + col) % 2 == 1:
-                    pos = self.indices_to_algebraic(row, col)
-                    self.place_figure(Checker("black"), pos)
+                    self.place_figure_fast(row, col, shared_figure(Checker, "black"))
 
     def setup_modified_chess(self):
         """Настраивает доску для игры в модифицированные шахматы."""
-        self.place_figure(LightRook("white"), "A1")
-        self.place_figure(Guardian("white"), "B1")
-        self.place_figure(ShortBishop("white"), "C1")
-        self.place_figure(Queen("white"), "D1")
-        self.place_figure(ChessKing("white"), "E1")
-        self.place_figure(ShortBishop("white"), "F1")
-        self.place_figure(Guardian("white"), "G1")
-        self.place_figure(LightRook("white"), "H1")
-        for column in "ABCDEFGH":
-            self.place_figure(Pawn("white"), column + "2")
-
-        self.place_figure(LightRook("black"), "A8")
-        self.place_figure(Guardian("black"), "B8")
-        self.place_figure(ShortBishop("black"), "C8")
-        self.place_figure(Queen("black"), "D8")
-        self.place_figure(ChessKing("black"), "E8")
-        self.place_figure(ShortBishop("black"), "F8")
-        self.place_figure(Guardian("black"), "G8")
-        self.place_figure(LightRook("black"), "H8")
-        for column in "ABCDEFGH":
-            self.place_figure(Pawn("black"), column + "7")
+        self.setup_ranks(MODIFIED_BACK_RANK)
+
+    def setup_ranks(self, back_rank):
+        """
+        Расставляет фигуры крайних горизонталей и пешки для шахматных вариантов.
+
+        Args:
+            back_rank (tuple): Классы фигур крайней горизонтали от A до H.
+        """
+        for column, figure_class in enumerate(back_rank):
+            self.place_figure_fast(7, column, shared_figure(figure_class, "white"))
+            self.place_figure_fast(0, column, shared_figure(figure_class, "black"))
+        for column in range(8):
+            self.place_figure_fast(6, column, shared_figure(Pawn, "white"))
+            self.place_figure_fast(1, column, shared_figure(Pawn, "black"))
 
     def is_guardian_protected(self, row, column, color):
         """
@@ -306,14 +388,7 @@ class Board:
         Returns:
             bool: True, если Guardian защищен, иначе False.
         """
-        for r in range(max(0, row - 1), min(8, row + 2)):
-            for c in range(max(0, column - 1), min(8, column + 2)):
-                if r == row and c == column:
-                    continue
-                piece = self.get_piece(r, c)
-                if piece and piece.color == color:
-                    return True
-        return False
+        return bool(KING_ATTACKS[row * 8 + column] & self.bb_by_color[color])
 
     def move_figure(self, from_position, to_position, current_player):
         """
@@ -329,96 +404,132 @@ class Board:
         """
         from_row, from_column = self.algebraic_to_indices(from_position)
         to_row, to_column = self.algebraic_to_indices(to_position)
+        from_square = from_row * 8 + from_column
+        to_square = to_row * 8 + to_column
+        figures = self.figures
+        figure = figures[from_square]
+        target = figures[to_square]
 
-        if self.board[from_row][from_column] == ".":
+        if figure is None:
             raise ValueError("Данная клетка пуста. Выберите фигуру, для того чтобы походить.")
 
-        figure = self.figures[(from_row, from_column)]
-
         if figure.color != current_player:
             raise ValueError("Вы можете двигать только свои фигуры.")
 
-        if not figure.can_move(to_row, to_column, self):
+        if not figure.can_move(from_square, to_square, self):
             raise ValueError(f"Фигура на {from_position} не может походить на {to_position}.")
 
-        # Проверка на взятие Guardian
-        if self.board[to_row][to_column] != ".":
-            target_figure = self.figures[(to_row, to_column)]
-            if (target_figure.__class__ == Guardian and 
-                self.is_guardian_protected(to_row, to_column, target_figure.color)):
+        target_code = self.board[to_square]
+        if target_code:
+            # Проверка на взятие Guardian
+            if (target_code >> 1 == GUARDIAN and
+                self.is_guardian_protected(to_row, to_column, target.color)):
                 raise ValueError("Нельзя взять Guardian, пока он защищён союзной фигурой.")
-
-        board_state, figures_state = self.save_state()
-        captured_figure = self.get_piece(to_row, to_column)
-
-        # Взятие на проходе для шахмат
-        if self.game_type == "chess" and figure.__class__ == Pawn and abs(to_column - from_column) == 1 and self.board[to_row][to_column] == ".":
-            if self.last_move:
-                last_from, last_to, last_piece = self.last_move
-                if (last_piece.__class__ == Pawn and
-                    abs(last_to[0] - last_from[0]) == 2 and
-                    last_to[0] == from_row and last_to[1] == to_column):
-                    captured_figure = self.get_piece(last_to[0], last_to[1])
-                    self.board[last_to[0]][last_to[1]] = "."
-                    del self.figures[(last_to[0], last_to[1])]
-
-        # Логика для шашек
-        if self.game_type == "checkers":
-            if figure.__class__ == Checker and abs(to_row - from_row) == 2:
-                mid_row = (from_row + to_row) // 2
-                mid_col = (from_column + to_column) // 2
-                captured_figure = self.get_piece(mid_row, mid_col)
-                self.board[mid_row][mid_col] = "."
-                del self.figures[(mid_row, mid_col)]
-            elif figure.__class__ == CheckerKing and self.enemy_to_capture:
-                enemy_row, enemy_col = self.enemy_to_capture
-                captured_figure = self.get_piece(enemy_row, enemy_col)
-                self.board[enemy_row][enemy_col] = "."
-                del self.figures[(enemy_row, enemy_col)]
-                self.enemy_to_capture = None
-
-        if self.board[to_row][to_column] != ".":
-            if self.figures[(to_row, to_column)].color == figure.color:
+            if not (target_code ^ figure.code) & 1:
                 raise ValueError(f"Нельзя походить на {to_position}, там стоит ваша фигура.")
-            else:
-                self.remove_figure(to_position)
 
-        self.board[from_row][from_column] = "."
-        del self.figures[(from_row, from_column)]
-        self.figures[(to_row, to_column)] = figure
-        figure.set_position(to_row, to_column)
-        self.board[to_row][to_column] = figure.symbol
-
-        self.last_move = ((from_row, from_column), (to_row, to_column), figure)
-        self.move_history.append(MoveHistory(
-            from_position, to_position, figure, captured_figure, self.last_move, (board_state, figures_state), current_player
-        ))
+        # Фигура для превращения пешки выбирается до изменения доски, чтобы
+        # некорректный выбор не оставил ход выполненным наполовину.
+        ptype = figure.ptype
+        promotion = PROMOTE_TABLE[ptype]
+        if (promotion is not None and promotion[0] == self._gt and
+                to_row == (0 if figure.color == "white" else 7)):
+            promoted_class = promotion[1] or self.choose_promotion(figure.color)
+        else:
+            promotion = None
+
+        take = self.take_from_square
+        captured_figure = target
+        captured_square = to_square
+
+        # Взятие на проходе в шахматах и взятие шашкой или дамкой
+        special_capture = self._special_capture
+        if special_capture is not None:
+            square = special_capture(ptype, from_square, to_square)
+            if square is not None:
+                captured_square = square
+                captured_figure = take(square)
+
+        if target is not None:
+            take(to_square)
+        take(from_square)
+        self.put_on_square(to_square, figure)
+
+        self.last_move = pack_move(from_square, to_square, figure.code,
+                                   captured_figure.code if captured_figure is not None else 0,
+                                   captured_square)
+        self.move_history.append(self.last_move)
+        self.ep_target = en_passant_target(self.last_move)
 
         # Увеличиваем счетчик ходов
         self.move_count += 1
 
-        # Превращение пешки в шахматах
-        if self.game_type == "chess" and figure.__class__ == Pawn:
-            if (figure.color == "white" and to_row == 0) or (figure.color == "black" and to_row == 7):
-                self.promote_pawn(to_row, to_column, figure.color)
-
-        # Превращение шашки в дамку
-        if self.game_type == "checkers" and figure.__class__ == Checker:
-            if (figure.color == "white" and to_row == 0) or (figure.color == "black" and to_row == 7):
-                new_king = CheckerKing(figure.color)
-                new_king.set_position(to_row, to_column)
-                self.figures[(to_row, to_column)] = new_king
-                self.board[to_row][to_column] = new_king.symbol
-
-        # Превращение LightRook в обычную ладью в модифицированных шахматах
-        if self.game_type == "modified_chess" and figure.__class__ == LightRook:
-            if (figure.color == "white" and to_row == 0) or (figure.color == "black" and to_row == 7):
-                new_rook = Rook(figure.color)
-                new_rook.set_position(to_row, to_column)
-                self.figures[(to_row, to_column)] = new_rook
-                self.board[to_row][to_column] = new_rook.symbol
-
-    def promote_pawn(self, row, column, color):
+        # Превращение пешки, шашки в дамку и LightRook в обычную ладью
+        if promotion is not None:
+            if promotion[1] is None:
+                self.promote_pawn(to_row, to_column, figure.color, promoted_class)
+            else:
+                self.take_from_square(to_square)
+                self.put_on_square(to_square, shared_figure(promoted_class, figure.color))
+
+    def en_passant_square(self, ptype, from_square, to_square):
+        """
+        Возвращает клетку пешки, взятой на проходе (для шахмат).
+
+        Args:
+            ptype (int): Тип перемещаемой фигуры.
+            from_square (int): Клетка, с которой ходит фигура.
+            to_square (int): Клетка назначения.
+
+        Returns:
+            int: Клетка взятой пешки или None, если ход не является взятием на проходе.
+        """
+        board = self.board
+        # Взятие на проходе делается на пустую клетку и только с пятой
+        # горизонтали своей стороны
+        if (ptype == PAWN and to_square == self.ep_target and not board[to_square] and
+                (from_square ^ to_square) & 7 and
+                from_square >> 3 == (4 if board[from_square] & 1 else 3)):
+            return from_square & ~7 | to_square & 7
+        return None
+
+    def checkers_capture_square(self, ptype, from_square, to_square):
+        """
+        Возвращает клетку шашки, взятой ходом шашки или дамки.
+
+        Args:
+            ptype (int): Тип перемещаемой фигуры.
+            from_square (int): Клетка, с которой ходит фигура.
+            to_square (int): Клетка назначения.
+
+        Returns:
+            int: Клетка взятой шашки или None, если ход не является взятием.
+        """
+        if ptype == CHECKER and abs((to_square >> 3) - (from_square >> 3)) == 2:
+            return (from_square + to_square) >> 1
+        if ptype == CHECKER_KING:
+            return self.figures[from_square].capture_square(from_square, to_square, self)
+        return None
+
+    def choose_promotion(self, color):
+        """
+        Запрашивает у функции выбора фигуру для превращения пешки.
+
+        Args:
+            color (str): Цвет пешки.
+
+        Returns:
+            type: Класс выбранной фигуры.
+
+        Raises:
+            ValueError: Если функция выбора вернула недопустимую фигуру.
+        """
+        figure_class = PROMOTION_CHOICES.get(self._promote(color).upper())
+        if figure_class is None:
+            raise ValueError("Некорректный выбор фигуры для превращения.")
+        return figure_class
+
+    def promote_pawn(self, row, column, color, figure_class=None):
         """
         Превращает пешку в другую фигуру.
 
@@ -426,23 +537,19 @@ class Board:
             row (int): Номер строки.
             column (int): Номер столбца.
             color (str): Цвет фигуры.
-        """
-        choice = input("Выберите фигуру для замены (Q - ферзь, R - ладья, B - слон, N - конь): ").upper()
-        while choice not in ["Q", "R", "B", "N"]:
-            choice = input("Некорректный выбор. Введите Q, R, B или N: ").upper()
+            figure_class (type, optional): Класс новой фигуры. Если не указан,
+                выбор запрашивается через choose_promotion.
 
-        if choice == "Q":
-            new_figure = Queen(color)
-        elif choice == "R":
-            new_figure = Rook(color)
-        elif choice == "B":
-            new_figure = Bishop(color)
-        elif choice == "N":
-            new_figure = Knight(color)
+        Raises:
+            ValueError: Если функция выбора вернула недопустимую фигуру.
+        """
+        if figure_class is None:
+            figure_class = self.choose_promotion(color)
+        new_figure = shared_figure(figure_class, color)
 
-        self.board[row][column] = new_figure.symbol
-        self.figures[(row, column)] = new_figure
-        new_figure.set_position(row, column)
+        square = row * 8 + column
+        self.take_from_square(square)
+        self.put_on_square(square, new_figure)
 
     def undo_move(self):
         """Отменяет последний ход.
@@ -454,16 +561,39 @@ class Board:
             print("Нет ходов для отмены.")
             return None
 
-        last_move = self.move_history.pop()
-        board_state, figures_state = last_move.board_state
-        self.restore_state(board_state, figures_state, last_move.last_move)
-        self.last_move = last_move.last_move
+        move = self.move_history.pop()
+        from_square = move & 63
+        to_square = move >> MOVE_TO_SHIFT & 63
+        code = move >> MOVE_CODE_SHIFT & 31
+        captured_code = move >> MOVE_CAPTURED_SHIFT & 31
+        # На клетке назначения может стоять уже превращенная фигура
+        self.take_from_square(to_square)
+        self.put_on_square(from_square, PIECES[code])
+        if captured_code:
+            self.put_on_square(move >> MOVE_CAPTURED_SQUARE_SHIFT & 63, PIECES[captured_code])
+        self.last_move = self.move_history[-1] if self.move_history else 0
+        self.ep_target = en_passant_target(self.last_move)
 
         self.move_count -= 1
 
-        print(f"Откат хода: {last_move.from_pos} -> {last_move.to_pos}")
+        from_pos, to_pos, current_player = self.decode_move(move)
+        print(f"Откат хода: {from_pos} -> {to_pos}")
         self.display()
-        return last_move.current_player
+        return current_player
+
+    def decode_move(self, move):
+        """
+        Раскладывает упакованный ход на позиции и игрока.
+
+        Args:
+            move (int): Ход, упакованный pack_move.
+
+        Returns:
+            tuple: Позиция откуда, позиция куда (в алгебраической нотации)
+            и игрок, который сделал ход.
+        """
+        return (_IDX2ALG[move & 63], _IDX2ALG[move >> MOVE_TO_SHIFT & 63],
+                SIDE_NAMES[move >> MOVE_CODE_SHIFT & 1])
 
     def get_player_figures(self, color):
         """
@@ -475,12 +605,14 @@ class Board:
         Returns:
             list: Список фигур.
         """
-        return [figure for figure in self.figures.values() if figure.color == color]
+        return list(self.by_color[color].values())
 
     def is_position_under_threat(self, row, column, opponent_color):
         """
         Проверяет, находится ли позиция под угрозой.
 
+        Использует битборд атак соперника из threat_mask.
+
         Args:
             row (int): Номер строки.
             column (int): Номер столбца.
@@ -489,31 +621,36 @@ class Board:
         Returns:
             bool: True, если позиция под угрозой, иначе False.
         """
-        for figure in self.figures.values():
-            if figure.color == opponent_color:
-                if figure.can_move(row, column, self):
-                    return True
-        return False
+        return bool(self.threat_mask(opponent_color) >> (row * 8 + column) & 1)
 
     def get_threatened_figures(self, current_player):
         """
         Возвращает список угрожаемых фигур и флаг шаха.
 
+        Результат кэшируется по current_player; кэш сбрасывается при
+        каждом изменении позиции.
+
         Args:
             current_player (str): Текущий игрок.
 
         Returns:
             tuple: Список угрожаемых позиций и флаг шаха.
         """
+        cache = self._threat_cache
+        if cache[0] == current_player:
+            return cache[1], cache[2]
+
         opponent_color = "black" if current_player == "white" else "white"
+        bb = self.threat_mask(opponent_color) & self.bb_by_color[current_player]
+
+        king_under_check = bool(bb & self.bb[KING_CODES[current_player]])
         threatened = []
-        king_under_check = False
-        for pos, figure in self.figures.items():
-            if figure.color == current_player:
-                if self.is_position_under_threat(pos[0], pos[1], opponent_color):
-                    threatened.append(pos)
-                    if figure.__class__ == ChessKing:
-                        king_under_check = True
+        while bb:
+            lsb = bb & -bb
+            square = lsb.bit_length() - 1
+            threatened.append((square >> 3, square & 7))
+            bb ^= lsb
+        self._threat_cache = (current_player, threatened, king_under_check)
         return threatened, king_under_check
 
     def display_with_threats(self, current_player):
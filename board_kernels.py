@@ -0,0 +1,153 @@
+"""
+Модуль с вычислительными ядрами для доски.
+
+Ядра работают только с примитивными данными (массив кодов клеток и целые
+числа), поэтому при установленном Numba компилируются через @njit. Без
+Numba функции остаются обычными функциями Python с тем же результатом.
+"""
+
+from figures import (PAWN, ROOK, KNIGHT, BISHOP, QUEEN, KING, LIGHT_ROOK,
+                     SHORT_BISHOP, GUARDIAN)
+
+try:
+    import numpy as np
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    np = None
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Заменяет numba.njit, если Numba не установлен: функция не изменяется."""
+        def decorator(func):
+            return func
+        return decorator
+
+# Битборды в ядрах хранятся как int64; клетка 63 попадает в знаковый бит.
+FULL_MASK = (1 << 64) - 1
+
+_KNIGHT_ROWS = (-2, -2, -1, -1, 1, 1, 2, 2)
+_KNIGHT_COLS = (-1, 1, -2, 2, -2, 2, -1, 1)
+_KING_ROWS = (-1, -1, -1, 0, 0, 1, 1, 1)
+_KING_COLS = (-1, 0, 1, -1, 1, -1, 0, 1)
+
+
+def as_array(board):
+    """
+    Возвращает представление доски, которое принимают ядра.
+
+    Args:
+        board (bytearray): Коды фигур по клеткам.
+
+    Returns:
+        Массив uint8 без копирования данных (при наличии NumPy) или сама доска.
+    """
+    if np is None:
+        return board
+    return np.frombuffer(board, dtype=np.uint8)
+
+
+@njit(cache=True)
+def _ray(square, occupied, row_step, col_step, limit):
+    """Атаки вдоль одного луча до первой занятой клетки включительно."""
+    mask = 0
+    row = (square >> 3) + row_step
+    col = (square & 7) + col_step
+    steps = 0
+    while 0 <= row < 8 and 0 <= col < 8 and steps < limit:
+        bit = 1 << (row * 8 + col)
+        mask |= bit
+        if occupied & bit:
+            break
+        row += row_step
+        col += col_step
+        steps += 1
+    return mask
+
+
+@njit(cache=True)
+def _steps(square, rows, cols):
+    """Атаки фигуры, ходящей фиксированными шагами."""
+    mask = 0
+    for i in range(len(rows)):
+        row = (square >> 3) + rows[i]
+        col = (square & 7) + cols[i]
+        if 0 <= row < 8 and 0 <= col < 8:
+            mask |= 1 << (row * 8 + col)
+    return mask
+
+
+@njit(cache=True)
+def _piece_attacks(ptype, color, square, occupied):
+    """Атаки одной фигуры; повторяет attack_mask классов из figures.py."""
+    mask = 0
+    if ptype == PAWN:
+        row = (square >> 3) + (1 if color else -1)
+        if 0 <= row < 8:
+            col = square & 7
+            if col > 0:
+                mask |= 1 << (row * 8 + col - 1)
+            if col < 7:
+                mask |= 1 << (row * 8 + col + 1)
+    elif ptype == KNIGHT:
+        mask = _steps(square, _KNIGHT_ROWS, _KNIGHT_COLS)
+    elif ptype == KING or ptype == GUARDIAN:
+        mask = _steps(square, _KING_ROWS, _KING_COLS)
+    else:
+        limit = 2 if ptype == LIGHT_ROOK or ptype == SHORT_BISHOP else 7
+        if ptype == ROOK or ptype == QUEEN or ptype == LIGHT_ROOK:
+            mask |= _ray(square, occupied, -1, 0, limit)
+            mask |= _ray(square, occupied, 1, 0, limit)
+            mask |= _ray(square, occupied, 0, -1, limit)
+            mask |= _ray(square, occupied, 0, 1, limit)
+        if ptype == BISHOP or ptype == QUEEN or ptype == SHORT_BISHOP:
+            mask |= _ray(square, occupied, -1, -1, limit)
+            mask |= _ray(square, occupied, -1, 1, limit)
+            mask |= _ray(square, occupied, 1, -1, limit)
+            mask |= _ray(square, occupied, 1, 1, limit)
+    return mask
+
+
+@njit(cache=True)
+def attacks_mask(board_arr, color):
+    """
+    Вычисляет битборд клеток, атакуемых фигурами указанного цвета.
+
+    Args:
+        board_arr: Массив из 64 кодов фигур (см. as_array).
+        color (int): Цвет (0 — белые, 1 — черные).
+
+    Returns:
+        int: Битборд атак; для перевода в неотрицательное число
+        используйте `& FULL_MASK`.
+    """
+    occupied = 0
+    for square in range(64):
+        if board_arr[square] != 0:
+            occupied |= 1 << square
+    mask = 0
+    for square in range(64):
+        code = int(board_arr[square])
+        if code != 0 and (code & 1) == color:
+            mask |= _piece_attacks(code >> 1, color, square, occupied)
+    return mask
+
+
+@njit(cache=True)
+def threatened_mask(board_arr, my_color):
+    """
+    Вычисляет битборд фигур указанного цвета, находящихся под угрозой.
+
+    Args:
+        board_arr: Массив из 64 кодов фигур (см. as_array).
+        my_color (int): Цвет (0 — белые, 1 — черные).
+
+    Returns:
+        int: Битборд угрожаемых клеток (см. примечание в attacks_mask).
+    """
+    mine = 0
+    for square in range(64):
+        code = int(board_arr[square])
+        if code != 0 and (code & 1) == my_color:
+            mine |= 1 << square
+    return attacks_mask(board_arr, 1 - my_color) & mine
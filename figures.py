@@ -3,17 +3,212 @@
 Содержит классы всех фигур и их логику перемещения.
 """
 
+from functools import lru_cache
+
+# Типы фигур. Код фигуры на доске: тип в старших битах, цвет в младшем
+# (0 — белые, 1 — черные); нулевой код означает пустую клетку.
+(PAWN, ROOK, KNIGHT, BISHOP, QUEEN, KING, CHECKER, CHECKER_KING,
+ LIGHT_ROOK, SHORT_BISHOP, GUARDIAN) = range(1, 12)
+CODE_COUNT = (GUARDIAN + 1) << 1
+
+ORTHOGONAL = ((-1, 0), (1, 0), (0, -1), (0, 1))
+DIAGONAL = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+KNIGHT_STEPS = ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+
+# Ход хранится одним целым числом: биты 0-5 — клетка откуда, 6-11 — клетка
+# куда, 12-16 — код фигуры (бит 12 — цвет), 17-21 — код взятой фигуры
+# (0 — без взятия), 22-27 — клетка взятой фигуры.
+MOVE_TO_SHIFT = 6
+MOVE_CODE_SHIFT = 12
+MOVE_CAPTURED_SHIFT = 17
+MOVE_CAPTURED_SQUARE_SHIFT = 22
+
+
+def pack_move(from_square, to_square, code, captured_code=0, captured_square=0):
+    """
+    Упаковывает ход в одно целое число.
+
+    Args:
+        from_square (int): Клетка, с которой ходит фигура.
+        to_square (int): Клетка назначения.
+        code (int): Код перемещаемой фигуры.
+        captured_code (int, optional): Код взятой фигуры (0 — без взятия).
+        captured_square (int, optional): Клетка взятой фигуры.
+
+    Returns:
+        int: Упакованный ход.
+    """
+    return (from_square | to_square << MOVE_TO_SHIFT | code << MOVE_CODE_SHIFT |
+            captured_code << MOVE_CAPTURED_SHIFT | captured_square << MOVE_CAPTURED_SQUARE_SHIFT)
+
+
+def en_passant_target(move):
+    """
+    Возвращает клетку, на которую после хода возможно взятие на проходе.
+
+    Args:
+        move (int): Ход, упакованный pack_move (0 — ходов не было).
+
+    Returns:
+        int: Клетка, через которую перешагнула пешка при ходе на две клетки,
+        или None, если ход не был таким ходом пешки.
+    """
+    from_square = move & 63
+    to_square = move >> MOVE_TO_SHIFT & 63
+    if move >> MOVE_CODE_SHIFT + 1 & 15 == PAWN and abs(to_square - from_square) == 16:
+        return (from_square + to_square) >> 1
+    return None
+
+
+def ray_attacks(square, occupied, directions, limit=7):
+    """
+    Строит битборд клеток, атакуемых вдоль лучей до первой занятой клетки.
+
+    Args:
+        square (int): Номер клетки (row * 8 + column).
+        occupied (int): Битборд занятых клеток.
+        directions (tuple): Направления лучей (шаг по строке, шаг по столбцу).
+        limit (int, optional): Максимальная длина луча. По умолчанию 7.
+
+    Returns:
+        int: Битборд атакуемых клеток (включая первую занятую клетку на луче).
+    """
+    mask = 0
+    for direction in directions:
+        ray = RAYS[direction][square]
+        blockers = ray & occupied
+        if blockers:
+            # Первая занятая клетка луча: младший бит для лучей в сторону
+            # больших номеров клеток, старший — для противоположных.
+            if direction[0] * 8 + direction[1] > 0:
+                first = (blockers & -blockers).bit_length() - 1
+            else:
+                first = blockers.bit_length() - 1
+            ray ^= RAYS[direction][first]
+        mask |= ray
+    if limit < 7:
+        mask &= REACH[limit][square]
+    return mask
+
+
+def step_attacks(square, steps):
+    """
+    Строит битборд клеток, достижимых из клетки одним из заданных шагов.
+
+    Args:
+        square (int): Номер клетки (row * 8 + column).
+        steps (tuple): Шаги (по строке, по столбцу).
+
+    Returns:
+        int: Битборд атакуемых клеток.
+    """
+    mask = 0
+    for row_step, col_step in steps:
+        row, col = (square >> 3) + row_step, (square & 7) + col_step
+        if 0 <= row < 8 and 0 <= col < 8:
+            mask |= 1 << (row * 8 + col)
+    return mask
+
+
+def build_between_table():
+    """
+    Строит таблицу битбордов клеток, лежащих строго между двумя клетками.
+
+    Returns:
+        list: Таблица BETWEEN[from_square][to_square]; для клеток, не лежащих
+        на одной горизонтали, вертикали или диагонали, значение равно 0.
+    """
+    table = [[0] * 64 for _ in range(64)]
+    for square in range(64):
+        for row_step, col_step in ORTHOGONAL + DIAGONAL:
+            mask = 0
+            row, col = (square >> 3) + row_step, (square & 7) + col_step
+            while 0 <= row < 8 and 0 <= col < 8:
+                table[square][row * 8 + col] = mask
+                mask |= 1 << (row * 8 + col)
+                row += row_step
+                col += col_step
+    return table
+
+
+BETWEEN = build_between_table()
+
+
+def build_ray_tables():
+    """
+    Строит таблицы лучей и зон досягаемости для ray_attacks.
+
+    Returns:
+        tuple: Словарь RAYS[direction][square] с битбордами полных лучей от
+        клетки (без нее самой) и список REACH[limit][square] с битбордами
+        клеток на расстоянии не больше limit по Чебышеву.
+    """
+    rays = {}
+    for row_step, col_step in ORTHOGONAL + DIAGONAL:
+        table = []
+        for square in range(64):
+            mask = 0
+            row, col = (square >> 3) + row_step, (square & 7) + col_step
+            while 0 <= row < 8 and 0 <= col < 8:
+                mask |= 1 << (row * 8 + col)
+                row += row_step
+                col += col_step
+            table.append(mask)
+        rays[(row_step, col_step)] = table
+    reach = []
+    for limit in range(8):
+        table = []
+        for square in range(64):
+            mask = 0
+            for other in range(64):
+                if max(abs((other >> 3) - (square >> 3)), abs((other & 7) - (square & 7))) <= limit:
+                    mask |= 1 << other
+            table.append(mask)
+        reach.append(table)
+    return rays, reach
+
+
+RAYS, REACH = build_ray_tables()
+
+# Клетки, лежащие на одной вертикали/горизонтали (или диагонали) с клеткой,
+# без нее самой: по этим таблицам дальнобойные фигуры проверяют, что цель
+# вообще лежит на их линии, прежде чем смотреть BETWEEN.
+ORTHOGONAL_LINES = [ray_attacks(square, 0, ORTHOGONAL) for square in range(64)]
+DIAGONAL_LINES = [ray_attacks(square, 0, DIAGONAL) for square in range(64)]
+
+# Битборды атак фигур, ходящих фиксированными шагами, по номеру клетки.
+KNIGHT_ATTACKS = [step_attacks(square, KNIGHT_STEPS) for square in range(64)]
+KING_ATTACKS = [step_attacks(square, ORTHOGONAL + DIAGONAL) for square in range(64)]
+PAWN_ATTACKS = {
+    "white": [step_attacks(square, ((-1, -1), (-1, 1))) for square in range(64)],
+    "black": [step_attacks(square, ((1, -1), (1, 1))) for square in range(64)],
+}
+# Ходы пешки без взятия: на одну клетку и на две с начальной горизонтали.
+PAWN_PUSHES = {
+    "white": [step_attacks(square, ((-1, 0),)) for square in range(64)],
+    "black": [step_attacks(square, ((1, 0),)) for square in range(64)],
+}
+PAWN_DOUBLE_PUSHES = {
+    "white": [step_attacks(square, ((-2, 0),)) if square >> 3 == 6 else 0 for square in range(64)],
+    "black": [step_attacks(square, ((2, 0),)) if square >> 3 == 1 else 0 for square in range(64)],
+}
+
+
 class Figure:
     """
     Базовый класс для всех фигур.
 
     Attributes:
         color (str): Цвет фигуры.
-        row (int): Номер строки на доске.
-        column (int): Номер столбца на доске.
         symbol (str): Символ фигуры.
+        ptype (int): Тип фигуры.
+        code (int): Код фигуры на доске (тип и цвет).
     """
 
+    __slots__ = ("color", "symbol", "code")
+
+    ptype = 0
+
     def __init__(self, color):
         """
         Инициализирует объект Figure.
@@ -22,32 +217,36 @@ class Figure:
             color (str): Цвет фигуры.
         """
         self.color = color
-        self.row = None
-        self.column = None
         self.symbol = None
+        self.code = self.ptype << 1 | (color != "white")
 
-    def set_position(self, row, column):
+    def can_move(self, from_square, to_square, board):
         """
-        Устанавливает позицию фигуры на доске.
+        Проверяет, может ли фигура переместиться на указанную позицию.
 
         Args:
-            row (int): Номер строки.
-            column (int): Номер столбца.
+            from_square (int): Клетка, на которой стоит фигура (row * 8 + column).
+            to_square (int): Клетка назначения.
+            board (Board): Объект доски.
+
+        Returns:
+            bool: True, если ход возможен, иначе False.
+
+        Raises:
+            NotImplementedError: Если метод не переопределен в подклассе.
         """
-        self.row = row
-        self.column = column
+        raise NotImplementedError("Этот метод должен быть реализован в подклассах")
 
-    def can_move(self, to_row, to_column, board):
+    def attack_mask(self, square, occupied):
         """
-        Проверяет, может ли фигура переместиться на указанную позицию.
+        Возвращает битборд клеток, которые атакует фигура.
 
         Args:
-            to_row (int): Номер строки назначения.
-            to_column (int): Номер столбца назначения.
-            board (Board): Объект доски.
+            square (int): Номер клетки фигуры (row * 8 + column).
+            occupied (int): Битборд занятых клеток.
 
         Returns:
-            bool: True, если ход возможен, иначе False.
+            int: Битборд атакуемых клеток.
 
         Raises:
             NotImplementedError: Если метод не переопределен в подклассе.
@@ -55,9 +254,78 @@ class Figure:
         raise NotImplementedError("Этот метод должен быть реализован в подклассах")
 
 
+@lru_cache(maxsize=4096)
+def _pawn_can_move(from_square, to_square, color, local_occ, ep_target):
+    """
+    Проверяет ход пешки по ее окрестности, не обращаясь к доске.
+
+    Args:
+        from_square (int): Клетка пешки.
+        to_square (int): Клетка назначения.
+        color (str): Цвет пешки.
+        local_occ (int): Биты окрестности: 1 — клетка назначения занята,
+            2 — на ней фигура соперника, 4 — занята клетка перед пешкой
+            (задается только для хода на две клетки вперед).
+        ep_target (int): Клетка для взятия на проходе (None — взятие невозможно).
+
+    Returns:
+        bool: True, если ход возможен, иначе False.
+    """
+    target = 1 << to_square
+    if target & PAWN_PUSHES[color][from_square]:
+        return not local_occ & 1
+    if target & PAWN_DOUBLE_PUSHES[color][from_square]:
+        return not local_occ & 5
+    if target & PAWN_ATTACKS[color][from_square]:
+        if local_occ & 2:
+            return True
+        # Взятие на проходе возможно только с пятой горизонтали своей стороны
+        return (to_square == ep_target and
+                from_square >> 3 == (3 if color == "white" else 4))
+    return False
+
+
+def _rook_can_move(from_square, to_square, board):
+    """
+    Проверяет ход по горизонтали или вертикали без фигур на пути.
+
+    Args:
+        from_square (int): Клетка, на которой стоит фигура.
+        to_square (int): Клетка назначения.
+        board (Board): Объект доски.
+
+    Returns:
+        bool: True, если ход возможен, иначе False.
+    """
+    if not ORTHOGONAL_LINES[from_square] >> to_square & 1:
+        return False
+    return not board.occupied & BETWEEN[from_square][to_square]
+
+
+def _bishop_can_move(from_square, to_square, board):
+    """
+    Проверяет ход по диагонали без фигур на пути.
+
+    Args:
+        from_square (int): Клетка, на которой стоит фигура.
+        to_square (int): Клетка назначения.
+        board (Board): Объект доски.
+
+    Returns:
+        bool: True, если ход возможен, иначе False.
+    """
+    if not DIAGONAL_LINES[from_square] >> to_square & 1:
+        return False
+    return not board.occupied & BETWEEN[from_square][to_square]
+
+
 class Pawn(Figure):
     """Класс для пешки."""
 
+    __slots__ = ()
+
+    ptype = PAWN
+
     def __init__(self, color):
         """
         Инициализирует объект Pawn.
@@ -68,48 +336,50 @@ class Pawn(Figure):
         super().__init__(color)
         self.symbol = "P" if color == "white" else "p"
 
-    def can_move(self, to_row, to_column, board):
+    def can_move(self, from_square, to_square, board):
         """
         Проверяет, может ли пешка переместиться на указанную позицию.
 
         Args:
-            to_row (int): Номер строки назначения.
-            to_column (int): Номер столбца назначения.
+            from_square (int): Клетка, на которой стоит фигура (row * 8 + column).
+            to_square (int): Клетка назначения.
             board (Board): Объект доски.
 
         Returns:
             bool: True, если ход возможен, иначе False.
         """
-        direction = -1 if self.color == "white" else 1
-        start_row = 6 if self.color == "white" else 1
+        cells = board.board
+        color_bit = self.code & 1
+        target = cells[to_square]
+        local_occ = 1 if target else 0
+        if target and (target & 1) != color_bit:
+            local_occ |= 2
+        # Клетку перед пешкой нужно смотреть только для хода на две клетки
+        if to_square - from_square == (16 if color_bit else -16) and cells[(from_square + to_square) >> 1]:
+            local_occ |= 4
+        return _pawn_can_move(from_square, to_square, self.color, local_occ, board.ep_target)
 
-        if to_column == self.column and to_row == self.row + direction:
-            if board.board[to_row][to_column] == ".":
-                return True
-
-        if (to_column == self.column and to_row == self.row + 2 * direction and
-                self.row == start_row and board.board[to_row][to_column] == "." and
-                board.board[self.row + direction][self.column] == "."):
-            return True
+    def attack_mask(self, square, occupied):
+        """
+        Возвращает битборд клеток, которые атакует пешка.
 
-        if (abs(to_column - self.column) == 1 and to_row == self.row + direction):
-            if board.board[to_row][to_column] != "." and board.figures[(to_row, to_column)].color != self.color:
-                return True
-            elif not board.get_piece(to_row, to_column):
-                last_move = board.last_move
-                if last_move:
-                    last_from, last_to, last_piece = last_move
-                    if (last_piece.__class__ == Pawn and
-                        abs(last_to[0] - last_from[0]) == 2 and
-                        last_to[0] == self.row and last_to[1] == to_column):
-                        return True
+        Args:
+            square (int): Номер клетки фигуры (row * 8 + column).
+            occupied (int): Битборд занятых клеток.
 
-        return False
+        Returns:
+            int: Битборд атакуемых клеток.
+        """
+        return PAWN_ATTACKS[self.color][square]
 
 
 class Rook(Figure):
     """Класс для ладьи."""
 
+    __slots__ = ()
+
+    ptype = ROOK
+
     def __init__(self, color):
         """
         Инициализирует объект Rook.
@@ -120,36 +390,41 @@ class Rook(Figure):
         super().__init__(color)
         self.symbol = "R" if color == "white" else "r"
 
-    def can_move(self, to_row, to_column, board):
+    def can_move(self, from_square, to_square, board):
         """
         Проверяет, может ли ладья переместиться на указанную позицию.
 
         Args:
-            to_row (int): Номер строки назначения.
-            to_column (int): Номер столбца назначения.
+            from_square (int): Клетка, на которой стоит фигура (row * 8 + column).
+            to_square (int): Клетка назначения.
             board (Board): Объект доски.
 
         Returns:
             bool: True, если ход возможен, иначе False.
         """
-        if to_row == self.row and to_column != self.column:
-            step = 1 if to_column > self.column else -1
-            for col in range(self.column + step, to_column, step):
-                if board.board[self.row][col] != ".":
-                    return False
-            return True
-        if to_column == self.column and to_row != self.row:
-            step = 1 if to_row > self.row else -1
-            for row in range(self.row + step, to_row, step):
-                if board.board[row][self.column] != ".":
-                    return False
-            return True
-        return False
+        return _rook_can_move(from_square, to_square, board)
+
+    def attack_mask(self, square, occupied):
+        """
+        Возвращает битборд клеток, которые атакует ладья.
+
+        Args:
+            square (int): Номер клетки фигуры (row * 8 + column).
+            occupied (int): Битборд занятых клеток.
+
+        Returns:
+            int: Битборд атакуемых клеток.
+        """
+        return ray_attacks(square, occupied, ORTHOGONAL)
 
 
 class Knight(Figure):
     """Класс для коня."""
 
+    __slots__ = ()
+
+    ptype = KNIGHT
+
     def __init__(self, color):
         """
         Инициализирует объект Knight.
@@ -160,26 +435,41 @@ class Knight(Figure):
         super().__init__(color)
         self.symbol = "N" if color == "white" else "n"
 
-    def can_move(self, to_row, to_column, board):
+    def can_move(self, from_square, to_square, board):
         """
         Проверяет, может ли конь переместиться на указанную позицию.
 
         Args:
-            to_row (int): Номер строки назначения.
-            to_column (int): Номер столбца назначения.
+            from_square (int): Клетка, на которой стоит фигура (row * 8 + column).
+            to_square (int): Клетка назначения.
             board (Board): Объект доски.
 
         Returns:
             bool: True, если ход возможен, иначе False.
         """
-        row_diff = abs(to_row - self.row)
-        col_diff = abs(to_column - self.column)
-        return (row_diff == 2 and col_diff == 1) or (row_diff == 1 and col_diff == 2)
+        return bool(KNIGHT_ATTACKS[from_square] >> to_square & 1)
+
+    def attack_mask(self, square, occupied):
+        """
+        Возвращает битборд клеток, которые атакует конь.
+
+        Args:
+            square (int): Номер клетки фигуры (row * 8 + column).
+            occupied (int): Битборд занятых клеток.
+
+        Returns:
+            int: Битборд атакуемых клеток.
+        """
+        return KNIGHT_ATTACKS[square]
 
 
 class Bishop(Figure):
     """Класс для слона."""
 
+    __slots__ = ()
+
+    ptype = BISHOP
+
     def __init__(self, color):
         """
         Инициализирует объект Bishop.
@@ -190,34 +480,41 @@ class Bishop(Figure):
         super().__init__(color)
         self.symbol = "B" if color == "white" else "b"
 
-    def can_move(self, to_row, to_column, board):
+    def can_move(self, from_square, to_square, board):
         """
         Проверяет, может ли слон переместиться на указанную позицию.
 
         Args:
-            to_row (int): Номер строки назначения.
-            to_column (int): Номер столбца назначения.
+            from_square (int): Клетка, на которой стоит фигура (row * 8 + column).
+            to_square (int): Клетка назначения.
             board (Board): Объект доски.
 
         Returns:
             bool: True, если ход возможен, иначе False.
         """
-        if abs(to_row - self.row) == abs(to_column - self.column):
-            row_step = 1 if to_row > self.row else -1
-            col_step = 1 if to_column > self.column else -1
-            row, col = self.row + row_step, self.column + col_step
-            while row != to_row and col != to_column:
-                if board.board[row][col] != ".":
-                    return False
-                row += row_step
-                col += col_step
-            return True
-        return False
+        return _bishop_can_move(from_square, to_square, board)
+
+    def attack_mask(self, square, occupied):
+        """
+        Возвращает битборд клеток, которые атакует слон.
+
+        Args:
+            square (int): Номер клетки фигуры (row * 8 + column).
+            occupied (int): Битборд занятых клеток.
+
+        Returns:
+            int: Битборд атакуемых клеток.
+        """
+        return ray_attacks(square, occupied, DIAGONAL)
 
 
 class Queen(Figure):
     """Класс для ферзя."""
 
+    __slots__ = ()
+
+    ptype = QUEEN
+
     def __init__(self, color):
         """
         Инициализирует объект Queen.
@@ -228,29 +525,43 @@ class Queen(Figure):
         super().__init__(color)
         self.symbol = "Q" if color == "white" else "q"
 
-    def can_move(self, to_row, to_column, board):
+    def can_move(self, from_square, to_square, board):
         """
         Проверяет, может ли ферзь переместиться на указанную позицию.
 
         Args:
-            to_row (int): Номер строки назначения.
-            to_column (int): Номер столбца назначения.
+            from_square (int): Клетка, на которой стоит фигура (row * 8 + column).
+            to_square (int): Клетка назначения.
             board (Board): Объект доски.
 
         Returns:
             bool: True, если ход возможен, иначе False.
         """
-        rook = Rook(self.color)
-        bishop = Bishop(self.color)
-        rook.set_position(self.row, self.column)
-        bishop.set_position(self.row, self.column)
-        return (rook.can_move(to_row, to_column, board) or
-                bishop.can_move(to_row, to_column, board))
+        if not (ORTHOGONAL_LINES[from_square] | DIAGONAL_LINES[from_square]) >> to_square & 1:
+            return False
+        return not board.occupied & BETWEEN[from_square][to_square]
+
+    def attack_mask(self, square, occupied):
+        """
+        Возвращает битборд клеток, которые атакует ферзь.
+
+        Args:
+            square (int): Номер клетки фигуры (row * 8 + column).
+            occupied (int): Битборд занятых клеток.
+
+        Returns:
+            int: Битборд атакуемых клеток.
+        """
+        return ray_attacks(square, occupied, ORTHOGONAL + DIAGONAL)
 
 
 class King(Figure):
     """Класс для короля."""
 
+    __slots__ = ()
+
+    ptype = KING
+
     def __init__(self, color):
         """
         Инициализирует объект King.
@@ -261,26 +572,41 @@ class King(Figure):
         super().__init__(color)
         self.symbol = "K" if color == "white" else "k"
 
-    def can_move(self, to_row, to_column, board):
+    def can_move(self, from_square, to_square, board):
         """
         Проверяет, может ли король переместиться на указанную позицию.
 
         Args:
-            to_row (int): Номер строки назначения.
-            to_column (int): Номер столбца назначения.
+            from_square (int): Клетка, на которой стоит фигура (row * 8 + column).
+            to_square (int): Клетка назначения.
             board (Board): Объект доски.
 
         Returns:
             bool: True, если ход возможен, иначе False.
         """
-        row_diff = abs(to_row - self.row)
-        col_diff = abs(to_column - self.column)
-        return max(row_diff, col_diff) == 1
+        return bool(KING_ATTACKS[from_square] >> to_square & 1)
+
+    def attack_mask(self, square, occupied):
+        """
+        Возвращает битборд клеток, которые атакует король.
+
+        Args:
+            square (int): Номер клетки фигуры (row * 8 + column).
+            occupied (int): Битборд занятых клеток.
+
+        Returns:
+            int: Битборд атакуемых клеток.
+        """
+        return KING_ATTACKS[square]
 
 
 class Checker(Figure):
     """Класс для шашки."""
 
+    __slots__ = ()
+
+    ptype = CHECKER
+
     def __init__(self, color):
         """
         Инициализирует объект Checker.
@@ -291,40 +617,58 @@ class Checker(Figure):
         super().__init__(color)
         self.symbol = "C" if color == "white" else "c"
 
-    def can_move(self, to_row, to_column, board):
+    def can_move(self, from_square, to_square, board):
         """
         Проверяет, может ли шашка переместиться на указанную позицию.
 
         Args:
-            to_row (int): Номер строки назначения.
-            to_column (int): Номер столбца назначения.
+            from_square (int): Клетка, на которой стоит фигура (row * 8 + column).
+            to_square (int): Клетка назначения.
             board (Board): Объект доски.
 
         Returns:
             bool: True, если ход возможен, иначе False.
         """
+        cells = board.board
+        # Шашка в любом случае ходит только на пустую клетку
+        if cells[to_square]:
+            return False
+
         direction = -1 if self.color == "white" else 1
-        row_diff = to_row - self.row
-        col_diff = abs(to_column - self.column)
+        row_diff = (to_square >> 3) - (from_square >> 3)
+        col_diff = abs((to_square & 7) - (from_square & 7))
 
         if row_diff == direction and col_diff == 1:
-            if board.board[to_row][to_column] == ".":
-                return True
+            return True
 
         if row_diff == 2 * direction and col_diff == 2:
-            mid_row = self.row + direction
-            mid_col = (self.column + to_column) // 2
-            if (board.board[mid_row][mid_col] != "." and 
-                board.figures[(mid_row, mid_col)].color != self.color and 
-                board.board[to_row][to_column] == "."):
-                return True
+            mid_code = cells[(from_square + to_square) >> 1]
+            return bool(mid_code and (mid_code ^ self.code) & 1)
 
         return False
 
+    def attack_mask(self, square, occupied):
+        """
+        Возвращает битборд клеток, которые атакует шашка.
+
+        Args:
+            square (int): Номер клетки фигуры (row * 8 + column).
+            occupied (int): Битборд занятых клеток.
+
+        Returns:
+            int: Битборд атакуемых клеток.
+        """
+        # Шашка ходит только на пустые клетки, поэтому занятым клеткам не угрожает.
+        return 0
+
 
 class CheckerKing(Figure):
     """Класс для дамки в шашках."""
 
+    __slots__ = ()
+
+    ptype = CHECKER_KING
+
     def __init__(self, color):
         """
         Инициализирует объект CheckerKing.
@@ -335,53 +679,70 @@ class CheckerKing(Figure):
         super().__init__(color)
         self.symbol = "K" if color == "white" else "k"
 
-    def can_move(self, to_row, to_column, board):
+    def can_move(self, from_square, to_square, board):
         """
         Проверяет, может ли дамка переместиться на указанную позицию.
 
         Args:
-            to_row (int): Номер строки назначения.
-            to_column (int): Номер столбца назначения.
+            from_square (int): Клетка, на которой стоит фигура (row * 8 + column).
+            to_square (int): Клетка назначения.
             board (Board): Объект доски.
 
         Returns:
             bool: True, если ход возможен, иначе False.
         """
-        if abs(to_row - self.row) != abs(to_column - self.column):
+        if not DIAGONAL_LINES[from_square] >> to_square & 1:
             return False
 
-        row_step = 1 if to_row > self.row else -1
-        col_step = 1 if to_column > self.column else -1
-        row, col = self.row + row_step, self.column + col_step
-        enemy_found = False
-        enemy_pos = None
-
-        while row != to_row and col != to_column:
-            if board.board[row][col] != ".":
-                if board.figures[(row, col)].color == self.color:
-                    return False
-                elif enemy_found:
-                    return False
-                else:
-                    enemy_found = True
-                    enemy_pos = (row, col)
-            row += row_step
-            col += col_step
-
-        if board.board[to_row][to_column] != ".":
+        between = BETWEEN[from_square][to_square]
+        if between & board.bb_by_color[self.color]:
+            return False
+        # Между клетками может стоять не больше одной фигуры соперника
+        enemies = between & board.occupied
+        if enemies & (enemies - 1):
             return False
 
-        if enemy_found:
-            board.enemy_to_capture = enemy_pos
-        else:
-            board.enemy_to_capture = None
+        return not board.board[to_square]
+
+    def capture_square(self, from_square, to_square, board):
+        """
+        Возвращает клетку шашки соперника, которую берет дамка при ходе.
+
+        Вызывается после того, как ход проверен через can_move.
 
-        return True
+        Args:
+            from_square (int): Клетка, на которой стоит фигура (row * 8 + column).
+            to_square (int): Клетка назначения.
+            board (Board): Объект доски.
+
+        Returns:
+            int: Клетка взятой фигуры или None, если ход без взятия.
+        """
+        enemies = BETWEEN[from_square][to_square] & board.occupied
+        return enemies.bit_length() - 1 if enemies else None
+
+    def attack_mask(self, square, occupied):
+        """
+        Возвращает битборд клеток, которые атакует дамка.
+
+        Args:
+            square (int): Номер клетки фигуры (row * 8 + column).
+            occupied (int): Битборд занятых клеток.
+
+        Returns:
+            int: Битборд атакуемых клеток.
+        """
+        # Дамка ходит только на пустые клетки, поэтому занятым клеткам не угрожает.
+        return 0
 
 
 class LightRook(Figure):
     """Класс для легкой ладьи в модифицированных шахматах."""
 
+    __slots__ = ()
+
+    ptype = LIGHT_ROOK
+
     def __init__(self, color):
         """
         Инициализирует объект LightRook.
@@ -392,41 +753,44 @@ class LightRook(Figure):
         super().__init__(color)
         self.symbol = "L" if color == "white" else "l"
 
-    def can_move(self, to_row, to_column, board):
+    def can_move(self, from_square, to_square, board):
         """
         Проверяет, может ли легкая ладья переместиться на указанную позицию.
 
         Args:
-            to_row (int): Номер строки назначения.
-            to_column (int): Номер столбца назначения.
+            from_square (int): Клетка, на которой стоит фигура (row * 8 + column).
+            to_square (int): Клетка назначения.
             board (Board): Объект доски.
 
         Returns:
             bool: True, если ход возможен, иначе False.
         """
-        row_diff = to_row - self.row
-        col_diff = to_column - self.column
+        # Движение по горизонтали или вертикали на 1 или 2 клетки
+        if not (ORTHOGONAL_LINES[from_square] & REACH[2][from_square]) >> to_square & 1:
+            return False
+        return not board.occupied & BETWEEN[from_square][to_square]
 
-        # Движение по горизонтали на 1 или 2 клетки
-        if row_diff == 0 and abs(col_diff) in [1, 2]:
-            step = 1 if col_diff > 0 else -1
-            for col in range(self.column + step, to_column, step):
-                if board.board[self.row][col] != ".":
-                    return False
-            return True
-        # Движение по вертикали на 1 или 2 клетки
-        elif col_diff == 0 and abs(row_diff) in [1, 2]:
-            step = 1 if row_diff > 0 else -1
-            for row in range(self.row + step, to_row, step):
-                if board.board[row][self.column] != ".":
-                    return False
-            return True
-        return False
+    def attack_mask(self, square, occupied):
+        """
+        Возвращает битборд клеток, которые атакует легкая ладья.
+
+        Args:
+            square (int): Номер клетки фигуры (row * 8 + column).
+            occupied (int): Битборд занятых клеток.
+
+        Returns:
+            int: Битборд атакуемых клеток.
+        """
+        return ray_attacks(square, occupied, ORTHOGONAL, limit=2)
 
 
 class ShortBishop(Figure):
     """Класс для короткого слона в модифицированных шахматах."""
 
+    __slots__ = ()
+
+    ptype = SHORT_BISHOP
+
     def __init__(self, color):
         """
         Инициализирует объект ShortBishop.
@@ -437,37 +801,44 @@ class ShortBishop(Figure):
         super().__init__(color)
         self.symbol = "S" if color == "white" else "s"
 
-    def can_move(self, to_row, to_column, board):
+    def can_move(self, from_square, to_square, board):
         """
         Проверяет, может ли короткий слон переместиться на указанную позицию.
 
         Args:
-            to_row (int): Номер строки назначения.
-            to_column (int): Номер столбца назначения.
+            from_square (int): Клетка, на которой стоит фигура (row * 8 + column).
+            to_square (int): Клетка назначения.
             board (Board): Объект доски.
 
         Returns:
             bool: True, если ход возможен, иначе False.
         """
-        row_diff = abs(to_row - self.row)
-        col_diff = abs(to_column - self.column)
+        # Движение по диагонали на 1 или 2 клетки
+        if not (DIAGONAL_LINES[from_square] & REACH[2][from_square]) >> to_square & 1:
+            return False
+        return not board.occupied & BETWEEN[from_square][to_square]
 
-        if row_diff == col_diff and row_diff in [1, 2]:
-            row_step = 1 if to_row > self.row else -1
-            col_step = 1 if to_column > self.column else -1
-            row, col = self.row + row_step, self.column + col_step
-            while row != to_row and col != to_column:
-                if board.board[row][col] != ".":
-                    return False
-                row += row_step
-                col += col_step
-            return True
-        return False
+    def attack_mask(self, square, occupied):
+        """
+        Возвращает битборд клеток, которые атакует короткий слон.
+
+        Args:
+            square (int): Номер клетки фигуры (row * 8 + column).
+            occupied (int): Битборд занятых клеток.
+
+        Returns:
+            int: Битборд атакуемых клеток.
+        """
+        return ray_attacks(square, occupied, DIAGONAL, limit=2)
 
 
 class Guardian(Figure):
     """Класс для стража в модифицированных шахматах."""
 
+    __slots__ = ()
+
+    ptype = GUARDIAN
+
     def __init__(self, color):
         """
         Инициализирует объект Guardian.
@@ -478,18 +849,87 @@ class Guardian(Figure):
         super().__init__(color)
         self.symbol = "G" if color == "white" else "g"
 
-    def can_move(self, to_row, to_column, board):
+    def can_move(self, from_square, to_square, board):
         """
         Проверяет, может ли страж переместиться на указанную позицию.
 
         Args:
-            to_row (int): Номер строки назначения.
-            to_column (int): Номер столбца назначения.
+            from_square (int): Клетка, на которой стоит фигура (row * 8 + column).
+            to_square (int): Клетка назначения.
             board (Board): Объект доски.
 
         Returns:
             bool: True, если ход возможен, иначе False.
         """
-        row_diff = abs(to_row - self.row)
-        col_diff = abs(to_column - self.column)
-        return max(row_diff, col_diff) == 1
\ No newline at end of file
+        return bool(KING_ATTACKS[from_square] >> to_square & 1)
+
+    def attack_mask(self, square, occupied):
+        """
+        Возвращает битборд клеток, которые атакует страж.
+
+        Args:
+            square (int): Номер клетки фигуры (row * 8 + column).
+            occupied (int): Битборд занятых клеток.
+
+        Returns:
+            int: Битборд атакуемых клеток.
+        """
+        return KING_ATTACKS[square]
+
+
+FIGURE_CLASSES = (Pawn, Rook, Knight, Bishop, Queen, King, Checker, CheckerKing,
+                  LightRook, ShortBishop, Guardian)
+
+
+def build_piece_table():
+    """
+    Строит таблицу общих экземпляров фигур, индексируемую кодом фигуры.
+
+    Фигура не хранит свою позицию, поэтому один экземпляр на пару
+    (класс, цвет) используется всей доской.
+
+    Returns:
+        list: Фигура для каждого кода; для кода 0 значение равно None.
+    """
+    table = [None] * CODE_COUNT
+    for figure_class in FIGURE_CLASSES:
+        for color in ("white", "black"):
+            figure = figure_class(color)
+            table[figure.code] = figure
+    return table
+
+
+PIECES = build_piece_table()
+
+
+def shared_figure(figure_class, color):
+    """
+    Возвращает общий экземпляр фигуры указанного класса и цвета.
+
+    Args:
+        figure_class (type): Класс фигуры.
+        color (str): Цвет фигуры.
+
+    Returns:
+        Figure: Экземпляр из PIECES.
+    """
+    return PIECES[figure_class.ptype << 1 | (color != "white")]
+
+
+def build_symbol_table():
+    """
+    Строит таблицу символов фигур, индексируемую кодом фигуры.
+
+    Returns:
+        bytes: Символ для каждого из 256 значений байта, чтобы таблицу можно
+        было передать в bytes.translate; код 0 (пустая клетка) и неиспользуемые
+        коды отображаются как ".".
+    """
+    table = bytearray(b"." * 256)
+    for figure in PIECES:
+        if figure is not None:
+            table[figure.code] = ord(figure.symbol)
+    return bytes(table)
+
+
+SYMBOLS = build_symbol_table()
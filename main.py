@@ -2,14 +2,102 @@
 Содержит функцию main, которая управляет игровым процессом.
 """
 
+import sys
+
 from board import Board
 
 
-def main():
+def quit_game(board, current_player):
+    """
+    Завершает игру и выводит историю ходов.
+
+    Args:
+        board (Board): Объект доски.
+        current_player (str): Текущий игрок.
+
+    Returns:
+        None: Игра завершена.
+    """
+    print("Игра завершена.")
+    print("\nИстория ходов:")
+    if not board.move_history:
+        print("Ходов не было.")
+    else:
+        lines = []
+        for i, move in enumerate(board.move_history, 1):
+            from_pos, to_pos, player = board.decode_move(move)
+            lines.append(f"{i}. {player.capitalize()}: {from_pos} -> {to_pos}\n")
+        sys.stdout.write("".join(lines))
+    return None
+
+
+def undo_last_move(board, current_player):
+    """
+    Отменяет последний ход.
+
+    Args:
+        board (Board): Объект доски.
+        current_player (str): Текущий игрок.
+
+    Returns:
+        str: Игрок, который должен сделать следующий ход.
+    """
+    new_player = board.undo_move()
+    return current_player if new_player is None else new_player
+
+
+def show_hint(board, current_player):
+    """
+    Показывает доску с угрожаемыми фигурами текущего игрока.
+
+    Args:
+        board (Board): Объект доски.
+        current_player (str): Текущий игрок.
+
+    Returns:
+        str: Текущий игрок (ход не меняется).
+    """
+    board.display_with_threats(current_player)
+    return current_player
+
+
+# Команды игрового цикла: функция получает доску и текущего игрока и
+# возвращает игрока, который ходит дальше, или None для выхода из игры.
+COMMANDS = {
+    "quit": quit_game,
+    "undo": undo_last_move,
+    "hint": show_hint,
+}
+
+
+def read_line(prompt, interactive):
+    """
+    Выводит приглашение и читает строку из стандартного ввода.
+
+    Args:
+        prompt (str): Текст приглашения.
+        interactive (bool): Нужно ли сбрасывать буфер вывода перед чтением
+            (при вводе с терминала, чтобы приглашение было видно).
+
+    Returns:
+        str: Прочитанная строка без пробелов по краям или None в конце ввода.
+    """
+    sys.stdout.write(prompt)
+    if interactive:
+        sys.stdout.flush()
+    line = sys.stdin.readline()
+    return line.strip() if line else None
+
+
+def main(quiet=False):
     """
     Основная функция для запуска игры.
 
     Запрашивает у пользователя выбор типа игры, настраивает доску и управляет игровым процессом.
+
+    Args:
+        quiet (bool, optional): Если True, после хода доска выводится без
+            подсветки угроз (угрозы показывает команда hint). По умолчанию False.
     """
     print("Выберите тип игры:")
     print("1. Шахматы")
@@ -24,8 +112,11 @@ def main():
     }
     
     
+    interactive = sys.stdin.isatty()
     while True:
-        choice = input("Введите номер (1-3): ").strip()
+        choice = read_line("Введите номер (1-3): ", interactive)
+        if choice is None:
+            return
         if choice in game_type_mapping:
             game_type = game_type_mapping[choice]
             break
@@ -41,27 +132,15 @@ def main():
     
     
     while True:
-        print(f"\nТекущее количество ходов: {board.move_count}")
-        move = input(f"Ход {current_player.capitalize()} (например, 'E2 E4', 'undo' для отмены или 'quit' для выхода): ")
-        
-        if move.lower() == "quit":
-            print("Игра завершена.")
-            print("\nИстория ходов:")
-            if not board.move_history:
-                print("Ходов не было.")
-            else:
-                for i, move in enumerate(board.move_history, 1):
-                    print(f"{i}. {move.current_player.capitalize()}: {move.from_pos} -> {move.to_pos}")
-            break
-        
-        if move.lower() == "undo":
-            new_player = board.undo_move()
-            if new_player is not None:
-                current_player = new_player
-            continue
-        
-        if move.lower() == "hint":
-            board.display_with_threats(current_player)
+        move = read_line(f"\nТекущее количество ходов: {board.move_count}\n"
+                         f"Ход {current_player.capitalize()} (например, 'E2 E4', 'undo' для отмены или 'quit' для выхода): ",
+                         interactive)
+        # Конец ввода (например, при игре по файлу ходов) завершает игру
+        command = COMMANDS.get("quit" if move is None else move.lower())
+        if command is not None:
+            current_player = command(board, current_player)
+            if current_player is None:
+                break
             continue
         
         try:
@@ -77,11 +156,14 @@ def main():
             
             board.move_figure(from_pos, to_pos, current_player)
             current_player = "black" if current_player == "white" else "white"
-            board.display_with_threats(current_player)
+            if quiet:
+                board.display()
+            else:
+                board.display_with_threats(current_player)
         
         except ValueError as e:
             print(e)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(quiet="--quiet" in sys.argv[1:])
\ No newline at end of file